@@ -1,15 +1,68 @@
-from contextlib import asynccontextmanager, contextmanager
-from typing import Any, AsyncIterator, Iterator
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, Iterator, Mapping
 
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session, configure_mappers, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+_POOL_DEFAULTS: dict[str, Any] = {
+    "pool_size": 10,
+    "max_overflow": 20,
+    "pool_recycle": 3600,
+    "pool_pre_ping": True,
+}
+_QUEUE_POOL_ONLY = ("pool_size", "max_overflow")
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def _default_engine_kwargs(url: str, kwargs: Mapping[str, Any]) -> dict[str, Any]:
+    """Picks engine defaults for the given URL.
+
+    In-memory SQLite gets a single shared ``StaticPool`` connection usable from any
+    thread; file-based SQLite keeps SQLAlchemy's own pooling. Server databases get
+    the pool defaults, minus the QueuePool-only sizing options when a custom
+    ``poolclass`` is given (e.g. ``NullPool`` for serverless), and none at all
+    when a prebuilt ``pool`` is passed.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.database in (None, "", ":memory:"):
+            return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+        return {}
+
+    if "pool" in kwargs:
+        # A prebuilt pool already carries its own settings; create_engine rejects pool options.
+        return {}
+
+    defaults = dict(_POOL_DEFAULTS)
+    if "poolclass" in kwargs:
+        for key in _QUEUE_POOL_ONLY:
+            defaults.pop(key)
+    return defaults
+
+
+def _engine_kwargs(url: str | None, kwargs: Mapping[str, Any] | None) -> Mapping[str, Any]:
+    """Merges URL specific defaults under user supplied engine kwargs."""
+    kwargs = kwargs or _EMPTY
+    if not url:
+        return kwargs
+
+    defaults = _default_engine_kwargs(url, kwargs)
+    if not defaults:
+        return kwargs
+    merged = {**defaults, **kwargs}
+    if "connect_args" in defaults and "connect_args" in kwargs:
+        merged["connect_args"] = {**defaults["connect_args"], **kwargs["connect_args"]}
+    return merged
 
 
 class InitMagic:
@@ -24,22 +77,22 @@ class InitMagic:
         async_engine_kwargs: dict[str, Any] | None = None,
         sync_session_kwargs: dict[str, Any] | None = None,
         async_session_kwargs: dict[str, Any] | None = None,
+        sync_engine_factory: Callable[..., Engine] = create_engine,
+        async_engine_factory: Callable[..., AsyncEngine] = create_async_engine,
     ) -> None:
         if not sync_url and not async_url:
             raise ValueError("Provide at least one of sync_url or async_url.")
 
         self.sync_url = sync_url
         self.async_url = async_url
-        self._sync_engine_kwargs = dict(sync_engine_kwargs or {})
-        self._async_engine_kwargs = dict(async_engine_kwargs or {})
-        self._sync_session_kwargs = dict(sync_session_kwargs or {})
-        self._async_session_kwargs = dict(async_session_kwargs or {})
+        self._sync_engine_kwargs = _engine_kwargs(sync_url, sync_engine_kwargs)
+        self._async_engine_kwargs = _engine_kwargs(async_url, async_engine_kwargs)
+        self._sync_session_kwargs = sync_session_kwargs or _EMPTY
+        self._async_session_kwargs = async_session_kwargs or _EMPTY
+        self._sync_engine_factory = sync_engine_factory
+        self._async_engine_factory = async_engine_factory
 
         self._base = self._create_base()
-        self._sync_engine: Engine | None = None
-        self._async_engine: AsyncEngine | None = None
-        self._sync_sessionmaker: sessionmaker[Session] | None = None
-        self._async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
 
     @staticmethod
     def _create_base() -> type[DeclarativeBase]:
@@ -66,43 +119,38 @@ class InitMagic:
             raise RuntimeError("Asynchronous database URL is not configured.")
         return self.async_url
 
-    @property
+    @cached_property
     def sync_engine(self) -> Engine:
-        if self._sync_engine is None:
-            url = self._require_sync_url()
-            self._sync_engine = create_engine(url, **self._sync_engine_kwargs)
-        return self._sync_engine
+        return self._sync_engine_factory(self._require_sync_url(), **self._sync_engine_kwargs)
 
-    @property
+    @cached_property
     def async_engine(self) -> AsyncEngine:
-        if self._async_engine is None:
-            url = self._require_async_url()
-            self._async_engine = create_async_engine(url, **self._async_engine_kwargs)
-        return self._async_engine
+        return self._async_engine_factory(self._require_async_url(), **self._async_engine_kwargs)
 
-    @property
+    @cached_property
     def sync_sessionmaker(self) -> sessionmaker[Session]:
-        if self._sync_sessionmaker is None:
-            engine = self.sync_engine
-            self._sync_sessionmaker = sessionmaker(
-                engine,
-                expire_on_commit=False,
-                class_=Session,
-                **self._sync_session_kwargs,
-            )
-        return self._sync_sessionmaker
-
-    @property
+        return sessionmaker(
+            self.sync_engine,
+            expire_on_commit=False,
+            class_=Session,
+            **self._sync_session_kwargs,
+        )
+
+    @cached_property
     def async_sessionmaker(self) -> async_sessionmaker[AsyncSession]:
-        if self._async_sessionmaker is None:
-            engine = self.async_engine
-            self._async_sessionmaker = async_sessionmaker(
-                engine,
-                expire_on_commit=False,
-                class_=AsyncSession,
-                **self._async_session_kwargs,
-            )
-        return self._async_sessionmaker
+        return async_sessionmaker(
+            self.async_engine,
+            expire_on_commit=False,
+            class_=AsyncSession,
+            **self._async_session_kwargs,
+        )
+
+    def warmup(self) -> None:
+        """Configures mappers and opens a first sync connection ahead of requests."""
+        configure_mappers()
+        if self.sync_url:
+            with self.sync_engine.connect():
+                pass
 
     @contextmanager
     def session(self, *, commit: bool = True) -> Iterator[Session]:
@@ -112,32 +160,20 @@ class InitMagic:
             if commit:
                 session.commit()
         except Exception:
-            try:
-                session.rollback()
-            except Exception:
-                pass
+            session.rollback()
             raise
         finally:
-            try:
-                session.close()
-            except Exception:
-                pass
+            session.close()
 
     @asynccontextmanager
     async def async_session(self, *, commit: bool = True) -> AsyncIterator[AsyncSession]:
-        session = self.async_sessionmaker()
-        try:
-            yield session
-            if commit:
-                await session.commit()
-        except Exception:
-            try:
-                await session.rollback()
-            except Exception:
-                pass
-            raise
-        finally:
+        async with AsyncExitStack() as stack:
+            session = self.async_sessionmaker()
+            stack.push_async_callback(session.close)
             try:
-                await session.close()
+                yield session
+                if commit:
+                    await session.commit()
             except Exception:
-                pass
+                await session.rollback()
+                raise
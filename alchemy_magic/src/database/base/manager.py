@@ -1,29 +1,77 @@
+from types import ModuleType
 from typing import Type, TypeVar
 
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from .mixin import SessionMixin
+
 T = TypeVar('T')
 
+
+def _is_concrete_model(model_class: type) -> bool:
+    """Отсеивает декларативные базы, __abstract__ и прочие классы ORM без маппера"""
+    if "registry" in model_class.__dict__ or "metadata" in model_class.__dict__:
+        return False
+    if model_class.__dict__.get("__abstract__"):
+        return False
+    if hasattr(model_class, "registry"):
+        return inspect(model_class, raiseerr=False) is not None
+    return True
+
+
 class DBManager:
 
     def __init__(self, session: AsyncSession | Session):
         self.session = session
         self._models = {}
+        self._bound_cache = {}
 
-    def __getattr__(self, name: str):
-        """Позволяет обращаться к моделям как к атрибутам"""
-        if name in self._models:
-            return self._models[name]
-        return None
+    def get(self, name: str):
+        """Возвращает зарегистрированную модель по имени или None"""
+        return self._models.get(name)
+
+    def _check_model_name(self, model_name: str) -> None:
+        if model_name not in self._models and hasattr(self, model_name):
+            raise ValueError(f"Model name '{model_name}' clashes with a DBManager attribute.")
 
     def register_model(self, model_class: Type[T], name: str | None = None) -> Type[T]:
-        """Регистрирует модель"""
-        model_name = name or model_class.__name__.lower()
-        bound_model = model_class.with_session(self.session)
+        """Регистрирует модель и делает её доступной как атрибут менеджера"""
+        model_name = name or model_class._registry_name
+        self._check_model_name(model_name)
+        bound_model = self.model(model_class)
         self._models[model_name] = bound_model
+        object.__setattr__(self, model_name, bound_model)
         return bound_model
 
+    def register_all(self, *modules: ModuleType) -> dict[str, type]:
+        """Регистрирует модели SessionMixin из указанных модулей за один проход.
+
+        Без аргументов обходит все подклассы SessionMixin в процессе, включая
+        сторонние и тестовые, поэтому модули лучше передавать явно.
+        """
+        module_names = {module.__name__ for module in modules}
+        bound_models = {}
+        for model_class in list(SessionMixin._all_models):
+            if module_names and model_class.__module__ not in module_names:
+                continue
+            if not _is_concrete_model(model_class):
+                continue
+            model_name = model_class._registry_name
+            if model_name in bound_models:
+                raise ValueError(f"Model name '{model_name}' is used by more than one model.")
+            self._check_model_name(model_name)
+            bound_models[model_name] = self.model(model_class)
+        self._models.update(bound_models)
+        self.__dict__.update(bound_models)
+        return bound_models
+
     def model(self, model_class: Type[T]) -> Type[T]:
         """Возвращает модель с привязанной сессией"""
-        return model_class.with_session(self.session)
\ No newline at end of file
+        bound_model = self._bound_cache.get(model_class)
+        if bound_model is None:
+            bound_model = self._bound_cache.setdefault(
+                model_class, model_class.with_session(self.session)
+            )
+        return bound_model
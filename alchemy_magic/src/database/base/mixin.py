@@ -1,4 +1,5 @@
-from typing import Type, TypeVar
+from typing import ClassVar, Type, TypeVar
+from weakref import WeakKeyDictionary, WeakValueDictionary
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
@@ -9,6 +10,22 @@ class SessionMixin:
     """Миксин для моделей SQLAlchemy с автоматической передачей сессии"""
 
     _session: Session | AsyncSession | None = None
+    # (класс, id(сессии)) -> подкласс; подкласс держит сессию, поэтому id не переиспользуется,
+    # а запись исчезает вместе с подклассом
+    _bound_cache: ClassVar[WeakValueDictionary[tuple[type, int], type]] = WeakValueDictionary()
+    # Имя для DBManager.register_model; подкласс может переопределить его в теле класса
+    _registry_name: ClassVar[str] = "sessionmixin"
+    # Все объявленные подклассы (кроме создаваемых в with_session) в порядке объявления;
+    # ссылки слабые, чтобы локальные и временные классы не жили вечно
+    _all_models: ClassVar[WeakKeyDictionary[type, None]] = WeakKeyDictionary()
+    _is_session_bound: ClassVar[bool] = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "_registry_name" not in cls.__dict__:
+            cls._registry_name = cls.__name__.lower()
+        if not cls.__dict__.get("_is_session_bound", False):
+            SessionMixin._all_models[cls] = None
 
     def bind_session(self, session: Session | AsyncSession):
         """Привязывает сессию к экземпляру модели"""
@@ -18,9 +35,15 @@ class SessionMixin:
     @classmethod
     def with_session(cls: Type[T], session: Session | AsyncSession) -> T:
         """Создает прокси для класса с привязанной сессией"""
+        key = (cls, id(session))
+        bound = SessionMixin._bound_cache.get(key)
+        if bound is not None:
+            return bound
 
         class SessionBoundModel(cls):
-            pass
+            _registry_name = cls._registry_name
+            _is_session_bound = True
 
         SessionBoundModel._session = session
-        return SessionBoundModel
\ No newline at end of file
+        SessionMixin._bound_cache[key] = SessionBoundModel
+        return SessionBoundModel
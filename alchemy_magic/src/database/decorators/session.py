@@ -1,35 +1,49 @@
-﻿from functools import wraps
+﻿import warnings
+from functools import wraps
 from typing import Callable
 
 
-class SessionRequired:
-    def __init__(self, async_mode: bool = False):
-        self.async_mode = async_mode
-
-    def __call__(self, func: Callable) -> Callable:
-        if self.async_mode:
-            @wraps(func)
-            async def async_wrapper(instance, *args, **kwargs):
-                if 'session' not in kwargs:
-                    session = getattr(instance, '_session', None)
-                    if session is None:
-                        raise RuntimeError(
-                            f"Session not found. Use model with DBContext or pass session explicitly."
-                        )
-                    kwargs['session'] = session
-                return await func(instance, *args, **kwargs)
-
-            return async_wrapper
-        else:
-            @wraps(func)
-            def sync_wrapper(instance, *args, **kwargs):
-                if 'session' not in kwargs:
-                    session = getattr(instance, '_session', None)
-                    if session is None:
-                        raise RuntimeError(
-                            f"Session not found. Use model with DBContext or pass session explicitly."
-                        )
-                    kwargs['session'] = session
-                return func(instance, *args, **kwargs)
-
-            return sync_wrapper
\ No newline at end of file
+def session_required(func: Callable) -> Callable:
+    @wraps(func)
+    def sync_wrapper(instance, *args, **kwargs):
+        if 'session' not in kwargs:
+            try:
+                session = instance._session
+            except AttributeError:
+                session = None
+            if session is None:
+                raise RuntimeError(
+                    "Session not found. Use model with DBContext or pass session explicitly."
+                )
+            kwargs['session'] = session
+        return func(instance, *args, **kwargs)
+
+    return sync_wrapper
+
+
+def async_session_required(func: Callable) -> Callable:
+    @wraps(func)
+    async def async_wrapper(instance, *args, **kwargs):
+        if 'session' not in kwargs:
+            try:
+                session = instance._session
+            except AttributeError:
+                session = None
+            if session is None:
+                raise RuntimeError(
+                    "Session not found. Use model with DBContext or pass session explicitly."
+                )
+            kwargs['session'] = session
+        return await func(instance, *args, **kwargs)
+
+    return async_wrapper
+
+
+def SessionRequired(async_mode: bool = False) -> Callable[[Callable], Callable]:
+    """Deprecated factory; use session_required / async_session_required instead."""
+    warnings.warn(
+        "SessionRequired is deprecated; use session_required or async_session_required.",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    return async_session_required if async_mode else session_required
@@ -1,12 +1,57 @@
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterator, Callable
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import Depends
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from fastapi import Depends, FastAPI
 
 from .base import InitMagic
 
 _magic_singleton: InitMagic | None = None
+_engine_cache: dict[tuple, Engine | AsyncEngine] = {}
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _is_isolated(url: str, kwargs: dict[str, Any]) -> bool:
+    # Each StaticPool / in-memory SQLite engine owns its own database, so sharing it
+    # between configurations would leak tables and rows from one into another.
+    if kwargs.get("poolclass") is StaticPool:
+        return True
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def _get_or_create_engine(factory: Callable, url: str, kwargs: dict[str, Any]):
+    if _is_isolated(url, kwargs):
+        return factory(url, **kwargs)
+    try:
+        key = (factory, url, _freeze(kwargs))
+        engine = _engine_cache.get(key)
+    except TypeError:
+        # Unhashable engine options: build the engine without caching it.
+        return factory(url, **kwargs)
+    if engine is None:
+        engine = _engine_cache[key] = factory(url, **kwargs)
+    return engine
+
+
+def _get_or_create_sync_engine(url: str, **kwargs: Any) -> Engine:
+    return _get_or_create_engine(create_engine, url, kwargs)
+
+
+def _get_or_create_async_engine(url: str, **kwargs: Any) -> AsyncEngine:
+    return _get_or_create_engine(create_async_engine, url, kwargs)
 
 
 def configure_magic(
@@ -17,6 +62,7 @@ def configure_magic(
     async_engine_kwargs: dict | None = None,
     sync_session_kwargs: dict | None = None,
     async_session_kwargs: dict | None = None,
+    warmup: bool = True,
 ) -> InitMagic:
     global _magic_singleton
     _magic_singleton = InitMagic(
@@ -26,7 +72,11 @@ def configure_magic(
         async_engine_kwargs=async_engine_kwargs,
         sync_session_kwargs=sync_session_kwargs,
         async_session_kwargs=async_session_kwargs,
+        sync_engine_factory=_get_or_create_sync_engine,
+        async_engine_factory=_get_or_create_async_engine,
     )
+    if warmup:
+        _magic_singleton.warmup()
     return _magic_singleton
 
 
@@ -41,7 +91,58 @@ async def get_session(magic: InitMagic = Depends(get_magic)) -> AsyncGenerator[A
         yield session
 
 
-@dataclass
+class _ReadOnlySession(Session):
+    """Sync session behind get_readonly_session; its flush guard is registered once, on the class."""
+
+
+@event.listens_for(_ReadOnlySession, "before_flush")
+def _reject_flush(session, flush_context, instances) -> None:
+    raise RuntimeError("Read-only session cannot flush changes. Use get_session for writes.")
+
+
+async def get_readonly_session(
+    magic: InitMagic = Depends(get_magic),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Yields a session on an AUTOCOMMIT connection, so reads skip BEGIN/COMMIT.
+
+    Flushing ORM changes raises, since on AUTOCOMMIT they would be committed at once.
+    Raw SQL passed to ``execute()`` is not checked.
+    """
+    async with magic.async_engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        async with magic.async_sessionmaker(
+            bind=connection, sync_session_class=_ReadOnlySession
+        ) as session:
+            yield session
+
+
+async def shutdown_magic() -> None:
+    """Disposes all cached engines plus the current InitMagic's own, then clears the cache."""
+    engines = list(_engine_cache.values())
+    _engine_cache.clear()
+    if _magic_singleton is not None:
+        # Check the cached_property slots so that engines are never created just to be disposed.
+        for name in ("async_engine", "sync_engine"):
+            engine = _magic_singleton.__dict__.get(name)
+            if engine is not None and not any(engine is item for item in engines):
+                engines.append(engine)
+    for engine in engines:
+        if isinstance(engine, AsyncEngine):
+            await engine.dispose()
+        else:
+            engine.dispose()
+
+
+@asynccontextmanager
+async def magic_lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """FastAPI lifespan that closes pooled connections on shutdown."""
+    try:
+        yield
+    finally:
+        await shutdown_magic()
+
+
+@dataclass(slots=True)
 class MagicScope:
     manager: InitMagic
     session: AsyncSession